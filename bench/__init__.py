@@ -0,0 +1 @@
+"""Нагрузочные тесты столовой: синтетическая школа и «утренний наплыв»."""
@@ -0,0 +1,306 @@
+"""«Утренний наплыв»: смешанная нагрузка на настоящие маршруты приложения.
+
+Ученики открывают календарь меню и счётчик уведомлений, повара выдают питание
+и ищут учеников, администратор изредка скачивает отчёт. Запросы идут либо
+внутри процесса через Flask test client, либо по HTTP на запущенный gunicorn.
+По каждому маршруту считаются p50/p95/p99, запросы в секунду, ошибки
+и ошибки блокировки SQLite («database is locked»). Результат сохраняется в JSON,
+его можно сравнить с прошлым прогоном (--compare).
+
+    python -m bench.rush --db /tmp/bench.db --students 3000 --duration 30
+    python -m bench.rush --db /tmp/bench.db --reuse --url http://127.0.0.1:8000
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import queue
+import random
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from bench.school import BENCH_PASSWORD, build_school, load_app
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+SEARCH_PREFIXES = ['Иван', 'Петр', 'Смир', 'Кузн', 'Соко', 'Фёдо', 'Семё', 'Алекс', 'Мари', 'Дарь']
+
+
+class InProcessClient:
+    def __init__(self, canteen):
+        self._client = canteen.app.test_client()
+
+    def request(self, method: str, path: str, payload=None):
+        response = self._client.open(path, method=method, json=payload)
+        try:
+            return response.status_code, response.get_data()
+        finally:
+            response.close()
+
+
+class HttpClient:
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, method: str, path: str, payload=None):
+        data = None
+        headers = {}
+        if payload is not None:
+            data = json.dumps(payload).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with self._opener.open(req, timeout=self.timeout) as resp:
+                return resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+class Recorder:
+    """Задержки и исходы по каждому маршруту (общий для всех потоков)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route: str, seconds: float, status: int, body: bytes):
+        locked = b'database is locked' in body or b'database table is locked' in body
+        with self._lock:
+            r = self._routes.setdefault(route, {'latencies': [], 'statuses': {}, 'errors': 0, 'lock_errors': 0})
+            r['latencies'].append(seconds)
+            r['statuses'][str(status)] = r['statuses'].get(str(status), 0) + 1
+            if status >= 500 or status == 0:
+                r['errors'] += 1
+            if locked:
+                r['lock_errors'] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        with self._lock:
+            result = {}
+            for route, r in sorted(self._routes.items()):
+                lat = sorted(r['latencies'])
+                result[route] = {
+                    'count': len(lat),
+                    'rps': round(len(lat) / elapsed, 2) if elapsed else 0,
+                    'p50_ms': _percentile_ms(lat, 50),
+                    'p95_ms': _percentile_ms(lat, 95),
+                    'p99_ms': _percentile_ms(lat, 99),
+                    'max_ms': round(lat[-1] * 1000, 2) if lat else None,
+                    'errors': r['errors'],
+                    'lock_errors': r['lock_errors'],
+                    'statuses': r['statuses'],
+                }
+            return result
+
+
+def _percentile_ms(sorted_values, pct: float):
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return round(sorted_values[k] * 1000, 2)
+
+
+def _call(client, recorder: Recorder, route: str, method: str, path: str, payload=None):
+    started = time.perf_counter()
+    try:
+        status, body = client.request(method, path, payload)
+    except Exception as e:
+        status, body = 0, str(e).encode('utf-8')
+    recorder.record(route, time.perf_counter() - started, status, body)
+    return status, body
+
+
+def _login(client, username: str):
+    status, body = client.request('POST', '/api/login', {'username': username, 'password': BENCH_PASSWORD})
+    if status != 200:
+        raise RuntimeError(f'не удалось войти как {username}: {status} {body[:200]!r}')
+
+
+def student_loop(client, recorder, stop, rnd, think):
+    while not stop.is_set():
+        _call(client, recorder, 'GET /api/menu_calendar', 'GET', '/api/menu_calendar')
+        _call(client, recorder, 'GET /api/notifications/unread_count', 'GET', '/api/notifications/unread_count')
+        _call(client, recorder, 'GET /api/menu', 'GET', f"/api/menu?category={rnd.choice(('breakfast', 'lunch'))}")
+        time.sleep(think * rnd.uniform(0.5, 1.5))
+
+
+def cook_loop(client, recorder, stop, rnd, think, pending: queue.Queue):
+    while not stop.is_set():
+        try:
+            student_id, meal_type = pending.get_nowait()
+        except queue.Empty:
+            return
+        prefix = rnd.choice(SEARCH_PREFIXES)
+        _call(client, recorder, 'GET /api/students/search', 'GET', f'/api/students/search?q={urllib.request.quote(prefix)}')
+        _call(client, recorder, 'POST /api/issue_meal', 'POST', '/api/issue_meal',
+              {'student_id': student_id, 'meal_type': meal_type})
+        time.sleep(think * rnd.uniform(0.5, 1.5))
+
+
+def admin_loop(client, recorder, stop, rnd, think):
+    while not stop.is_set():
+        _call(client, recorder, 'GET /api/report/download', 'GET', '/api/report/download?format=pdf&days=30')
+        _call(client, recorder, 'GET /api/statistics', 'GET', '/api/statistics')
+        stop.wait(think * 20 * rnd.uniform(0.5, 1.5))
+
+
+def run_rush(make_client, student_usernames, student_ids, cook_usernames, duration: float,
+             student_threads: int, cook_threads: int, admin_threads: int, think: float, seed: int) -> dict:
+    rnd = random.Random(seed)
+    recorder = Recorder()
+    stop = threading.Event()
+
+    pending = queue.Queue()
+    order = list(student_ids)
+    rnd.shuffle(order)
+    for student_id in order:
+        pending.put((student_id, 'breakfast'))
+
+    workers = []
+    for i in range(student_threads):
+        client = make_client()
+        _login(client, student_usernames[i % len(student_usernames)])
+        workers.append(threading.Thread(target=student_loop, args=(client, recorder, stop, random.Random(seed + i), think)))
+    for i in range(cook_threads):
+        client = make_client()
+        _login(client, cook_usernames[i % len(cook_usernames)])
+        workers.append(threading.Thread(target=cook_loop, args=(client, recorder, stop, random.Random(seed + 1000 + i), think, pending)))
+    for i in range(admin_threads):
+        client = make_client()
+        _login(client, 'admin1')
+        workers.append(threading.Thread(target=admin_loop, args=(client, recorder, stop, random.Random(seed + 2000 + i), think)))
+
+    started = time.perf_counter()
+    for w in workers:
+        w.daemon = True
+        w.start()
+    stop.wait(duration)
+    stop.set()
+    for w in workers:
+        w.join(timeout=60)
+    elapsed = time.perf_counter() - started
+
+    routes = recorder.summary(elapsed)
+    total = sum(r['count'] for r in routes.values())
+    return {
+        'elapsed_seconds': round(elapsed, 2),
+        'requests': total,
+        'rps': round(total / elapsed, 2) if elapsed else 0,
+        'errors': sum(r['errors'] for r in routes.values()),
+        'lock_errors': sum(r['lock_errors'] for r in routes.values()),
+        'routes': routes,
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(RESULTS_DIR), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return 'unknown'
+
+
+def print_report(result: dict, baseline=None):
+    print(f"\nЗапросов: {result['requests']} за {result['elapsed_seconds']} с, "
+          f"{result['rps']} запр/с, ошибок: {result['errors']}, блокировок: {result['lock_errors']}")
+    header = f"{'маршрут':42} {'кол-во':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'ошиб':>5} {'блок':>5}"
+    print(header)
+    print('-' * len(header))
+    base_routes = (baseline or {}).get('routes', {})
+    for route, r in result['routes'].items():
+        line = (f"{route:42} {r['count']:>7} {r['rps']:>8} {r['p50_ms'] or 0:>8} {r['p95_ms'] or 0:>8} "
+                f"{r['p99_ms'] or 0:>8} {r['errors']:>5} {r['lock_errors']:>5}")
+        base = base_routes.get(route)
+        if base and base.get('p95_ms') and r.get('p95_ms'):
+            delta = (r['p95_ms'] - base['p95_ms']) / base['p95_ms'] * 100
+            line += f"   p95 {delta:+.0f}% (было {base['p95_ms']})"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Нагрузочный тест «утренний наплыв»')
+    parser.add_argument('--db', required=True, help='база для теста (создаётся, если нет --reuse)')
+    parser.add_argument('--reuse', action='store_true', help='использовать уже сгенерированную базу')
+    parser.add_argument('--students', type=int, default=3000)
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--url', help='адрес запущенного сервера; без него запросы идут внутри процесса')
+    parser.add_argument('--duration', type=float, default=30.0, help='длительность наплыва, с')
+    parser.add_argument('--student-threads', type=int, default=16)
+    parser.add_argument('--cook-threads', type=int, default=4)
+    parser.add_argument('--admin-threads', type=int, default=1)
+    parser.add_argument('--think', type=float, default=0.05, help='пауза между действиями клиента, с')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', help='куда сохранить JSON (по умолчанию bench/results/)')
+    parser.add_argument('--compare', help='JSON прошлого прогона для сравнения')
+    args = parser.parse_args(argv)
+
+    if args.reuse:
+        canteen = load_app(args.db)
+        school = None
+    else:
+        school = build_school(args.db, students=args.students, days=args.days, seed=args.seed)
+        canteen = load_app(args.db)
+        print(f"Школа создана за {school['seconds']} с: {school['students']} учеников, {school['meal_claims']} выдач")
+
+    db = canteen.get_db()
+    students = db.execute("SELECT id, username FROM users WHERE role = 'student' AND username LIKE 'bench_s%' ORDER BY id").fetchall()
+    cooks = [r['username'] for r in db.execute("SELECT username FROM users WHERE username LIKE 'bench_cook%' ORDER BY id")]
+    db.close()
+    if not students or not cooks:
+        parser.error('в базе нет данных bench — создайте её без --reuse')
+
+    if args.url:
+        make_client = lambda: HttpClient(args.url)
+    else:
+        make_client = lambda: InProcessClient(canteen)
+
+    result = run_rush(
+        make_client,
+        [r['username'] for r in students],
+        [r['id'] for r in students],
+        cooks,
+        duration=args.duration,
+        student_threads=args.student_threads,
+        cook_threads=args.cook_threads,
+        admin_threads=args.admin_threads,
+        think=args.think,
+        seed=args.seed,
+    )
+    result['meta'] = {
+        'revision': _git_revision(),
+        'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'mode': 'http' if args.url else 'inprocess',
+        'url': args.url,
+        'students': len(students),
+        'school': school,
+        'args': vars(args),
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    out = args.out
+    if not out:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        ts = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        out = os.path.join(RESULTS_DIR, f"rush_{ts}_{result['meta']['revision']}.json")
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f'\nРезультат сохранён: {out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""Генератор синтетической школы для нагрузочных тестов.
+
+Создаёт в отдельной базе (CANTEEN_DB) учеников, абонементы, историю выдач,
+оплат и уведомлений за заданное число дней. Все ученики получают пароль
+BENCH_PASSWORD, повара — логины bench_cook<N>, администратор — admin1.
+
+    python -m bench.school --db /tmp/bench.db --students 3000 --days 180
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+BENCH_PASSWORD = 'password123'
+
+LAST_NAMES = [
+    'Иванов', 'Петров', 'Сидоров', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Соколов',
+    'Михайлов', 'Новиков', 'Фёдоров', 'Морозов', 'Волков', 'Алексеев', 'Лебедев', 'Семёнов',
+    'Егоров', 'Павлов', 'Козлов', 'Степанов', 'Николаев', 'Орлов', 'Андреев', 'Макаров',
+]
+FIRST_NAMES = [
+    'Александр', 'Максим', 'Артём', 'Михаил', 'Иван', 'Дмитрий', 'Даниил', 'Кирилл', 'Егор', 'Семён',
+    'Анна', 'Мария', 'София', 'Алиса', 'Виктория', 'Полина', 'Елизавета', 'Дарья', 'Ксения', 'Алёна',
+]
+CLASS_LETTERS = 'АБВГ'
+
+
+def load_app(db_path: str):
+    """Импортирует app с базой db_path (путь к базе читается при импорте).
+
+    Отчёты сохраняются рядом с базой, а не в reports/ репозитория.
+    """
+    os.environ['CANTEEN_DB'] = os.path.abspath(db_path)
+    os.environ.setdefault('CANTEEN_REPORTS_DIR', os.path.join(os.path.dirname(os.path.abspath(db_path)), 'reports'))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    import app as canteen
+    if os.path.abspath(canteen.DATABASE) != os.path.abspath(db_path):
+        raise RuntimeError(f'app уже импортирован с базой {canteen.DATABASE}')
+    return canteen
+
+
+def _student_name(rnd: random.Random, i: int) -> str:
+    last = rnd.choice(LAST_NAMES)
+    first = rnd.choice(FIRST_NAMES)
+    if first[-1] in 'аяАЯ' and last[-1] in 'вн':
+        last += 'а'
+    return f'{last} {first} {i}'
+
+
+def build_school(db_path: str, students: int = 3000, days: int = 180, cooks: int = 4,
+                 attendance: float = 0.7, subscription_share: float = 0.4,
+                 notifications_per_student: int = 20, seed: int = 1) -> dict:
+    """Заполняет пустую базу db_path. Возвращает сводку о созданных данных."""
+    if os.path.exists(db_path):
+        raise FileExistsError(f'{db_path} уже существует — удалите его или используйте --reuse')
+
+    canteen = load_app(db_path)
+    from werkzeug.security import generate_password_hash
+
+    rnd = random.Random(seed)
+    started = time.perf_counter()
+    canteen.init_db()
+
+    db = canteen.get_db()
+    cursor = db.cursor()
+    password = generate_password_hash(BENCH_PASSWORD)
+
+    cursor.executemany(
+        "INSERT INTO users (username, password, full_name, role) VALUES (?, ?, ?, 'cook')",
+        [(f'bench_cook{i}', password, f'Повар {i}') for i in range(1, cooks + 1)]
+    )
+    cursor.executemany(
+        """
+        INSERT INTO users (username, password, full_name, school, class_name, role, balance)
+        VALUES (?, ?, ?, 'Школа №1', ?, 'student', ?)
+        """,
+        [
+            (
+                f'bench_s{i:05d}', password, _student_name(rnd, i),
+                f'{rnd.randint(1, 11)}{rnd.choice(CLASS_LETTERS)}', 100000,
+            )
+            for i in range(1, students + 1)
+        ]
+    )
+    student_ids = [r['id'] for r in cursor.execute("SELECT id FROM users WHERE username LIKE 'bench_s%' ORDER BY id")]
+    cook_ids = [r['id'] for r in cursor.execute("SELECT id FROM users WHERE username LIKE 'bench_cook%' ORDER BY id")]
+    dishes = {
+        meal: [r['id'] for r in cursor.execute("SELECT id FROM menu_items WHERE category = ?", (meal,))]
+        for meal in ('breakfast', 'lunch')
+    }
+
+    today = datetime.now().date()
+    history_days = [today - timedelta(days=d) for d in range(days, 0, -1)]
+    school_days = [d for d in history_days if d.weekday() < 5]
+
+    subscribers = {}
+    payments = []
+    for user_id in student_ids:
+        if rnd.random() < subscription_share:
+            meal = rnd.choice(('breakfast', 'lunch', 'both'))
+            subscribers[user_id] = meal
+            bought = history_days[0] if history_days else today
+            payments.append((user_id, 4000.0, 'subscription', meal, 400, 'active',
+                             f'{bought} 07:30:00', bought.strftime('%Y-%m-%d')))
+        for _ in range(rnd.randint(0, max(1, days // 30))):
+            day = rnd.choice(history_days) if history_days else today
+            payments.append((user_id, float(rnd.choice((200, 500, 1000))), 'single', None, 0, 'active',
+                             f'{day} 18:{rnd.randint(10, 59)}:00', day.strftime('%Y-%m-%d')))
+    payments.sort(key=lambda p: p[6])
+    cursor.executemany(
+        """
+        INSERT INTO payments (user_id, amount, payment_type, meal_type, days_remaining, status, created_at, created_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        payments
+    )
+
+    claims = 0
+    for day in school_days:
+        rows = []
+        for user_id in student_ids:
+            if rnd.random() >= attendance:
+                continue
+            meals = ['lunch'] if rnd.random() < 0.5 else ['breakfast', 'lunch']
+            for meal in meals:
+                minute = rnd.randint(0, 59)
+                hour = 8 if meal == 'breakfast' else 12
+                rows.append((
+                    user_id, meal, rnd.choice(cook_ids),
+                    rnd.choice(dishes[meal]) if dishes[meal] else None,
+                    f'{day} {hour:02d}:{minute:02d}:00', day.strftime('%Y-%m-%d'),
+                ))
+        rows.sort(key=lambda r: r[4])
+        cursor.executemany(
+            """
+            INSERT INTO meal_claims (user_id, meal_type, issued_by, menu_item_id, claimed_at, claim_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            rows
+        )
+        claims += len(rows)
+
+    notifications = []
+    for user_id in student_ids:
+        for _ in range(notifications_per_student):
+            day = rnd.choice(history_days) if history_days else today
+            notifications.append(('Выдача питания', 'Питание выдано', 'all', user_id, f'{day} 12:00:00'))
+    for _ in range(max(10, days)):
+        day = rnd.choice(history_days) if history_days else today
+        notifications.append(('Объявление', 'Изменение в меню', rnd.choice(('all', 'student', 'staff')), None, f'{day} 09:00:00'))
+    notifications.sort(key=lambda n: n[4])
+    cursor.executemany(
+        "INSERT INTO notifications (title, message, audience, recipient_id, created_at) VALUES (?, ?, ?, ?, ?)",
+        notifications
+    )
+
+    # Наплыв не должен упираться в остатки на складе
+    cursor.execute("UPDATE products SET quantity = 1000000000, updated_at = CURRENT_TIMESTAMP")
+    canteen.rebuild_daily_stats(cursor)
+    canteen.rebuild_notification_counters(cursor)
+    db.commit()
+    cursor.execute("ANALYZE")
+    db.close()
+
+    return {
+        'db': os.path.abspath(db_path),
+        'students': len(student_ids),
+        'cooks': len(cook_ids),
+        'subscriptions': len(subscribers),
+        'payments': len(payments),
+        'meal_claims': claims,
+        'notifications': len(notifications),
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Синтетическая школа для нагрузочных тестов')
+    parser.add_argument('--db', required=True, help='путь к новой базе')
+    parser.add_argument('--students', type=int, default=3000)
+    parser.add_argument('--days', type=int, default=180, help='глубина истории в днях')
+    parser.add_argument('--cooks', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    summary = build_school(args.db, students=args.students, days=args.days, cooks=args.cooks, seed=args.seed)
+    for key, value in summary.items():
+        print(f'{key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,13 +3,14 @@ set -eu
 : "${PORT:=8000}"
 : "${WORKERS:=1}"
 : "${THREADS:=4}"
+export THREADS
 : "${TIMEOUT:=120}"
 : "${CANTEEN_DB:=/data/canteen.db}"
 : "${CANTEEN_REPORTS_DIR:=/data/reports}"
 
 mkdir -p "$(dirname "$CANTEEN_DB")" "$CANTEEN_REPORTS_DIR"
 
-python -c "from app import init_db; init_db()"
+python -c "import logging; logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s'); from app import init_db; init_db()"
 
 exec gunicorn \
   --bind "0.0.0.0:${PORT}" \
@@ -0,0 +1,292 @@
+"""PDF-отчёт столовой (reportlab).
+
+Шрифты, стили абзацев и стили таблиц создаются один раз на процесс (warm()).
+Таблицы собираются как LongTable с фиксированной высотой строки и повтором
+заголовка на каждой странице: reportlab не измеряет каждую ячейку заново
+при переносе таблицы на следующую страницу. render() возвращает байты PDF
+и время построения по разделам.
+"""
+import io
+import os
+import threading
+import time
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Flowable, LongTable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')
+
+REGULAR_FONT_PATHS = (
+    os.path.join(FONTS_DIR, 'DejaVuSans.ttf'),
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/truetype/dejavu/dejavusans.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+    '/Library/Fonts/DejaVuSans.ttf',
+    r'C:\Windows\Fonts\DejaVuSans.ttf',
+    r'C:\Windows\Fonts\arial.ttf',
+)
+
+BOLD_FONT_PATHS = (
+    os.path.join(FONTS_DIR, 'DejaVuSans-Bold.ttf'),
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    '/usr/share/fonts/truetype/dejavu/dejavusans-bold.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf',
+    '/Library/Fonts/DejaVuSans-Bold.ttf',
+    r'C:\Windows\Fonts\DejaVuSans-Bold.ttf',
+    r'C:\Windows\Fonts\arialbd.ttf',
+)
+
+MEAL_LABELS = {'breakfast': 'Завтрак', 'lunch': 'Обед'}
+
+# Сколько заявок на закупку попадает в PDF (полный список есть в CSV и JSON)
+PENDING_ROWS_MAX = 25
+
+# Оформление таблиц: цвет шапки, цвет сетки, отступ в ячейке, размер шрифта
+TABLE_THEMES = {
+    'summary': ('#F3F4F6', '#D1D5DB', 6, None),
+    'visits': ('#F9FAFB', '#E5E7EB', 6, None),
+    'low_stock': ('#FEF3C7', '#F59E0B', 6, None),
+    'pending': ('#EFF6FF', '#BFDBFE', 4, 9),
+    'top_dishes': ('#F3F4F6', '#E5E7EB', 6, None),
+}
+
+_lock = threading.Lock()
+_resources = None
+
+
+def _first_existing(paths):
+    for p in paths:
+        try:
+            if p and os.path.exists(p):
+                return p
+        except Exception:
+            pass
+    return None
+
+
+def _register_fonts():
+    """Регистрирует DejaVuSans (нужна кириллица). Если шрифта нет — Helvetica."""
+    regular_path = _first_existing(REGULAR_FONT_PATHS)
+    bold_path = _first_existing(BOLD_FONT_PATHS)
+    try:
+        if not regular_path:
+            return 'Helvetica', 'Helvetica-Bold'
+        registered = pdfmetrics.getRegisteredFontNames()
+        if 'DejaVuSans' not in registered:
+            pdfmetrics.registerFont(TTFont('DejaVuSans', regular_path))
+        if not bold_path:
+            return 'DejaVuSans', 'DejaVuSans'
+        if 'DejaVuSans-Bold' not in registered:
+            pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', bold_path))
+        return 'DejaVuSans', 'DejaVuSans-Bold'
+    except Exception:
+        return 'Helvetica', 'Helvetica-Bold'
+
+
+def _table_style(font, font_bold, header_bg, grid, padding, font_size):
+    commands = [
+        ('FONTNAME', (0, 0), (-1, -1), font),
+        ('FONTNAME', (0, 0), (-1, 0), font_bold),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(header_bg)),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor(grid)),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('PADDING', (0, 0), (-1, -1), padding),
+    ]
+    if font_size:
+        commands.append(('FONTSIZE', (0, 0), (-1, -1), font_size))
+    return TableStyle(commands)
+
+
+def _row_height(style) -> float:
+    """Высота однострочной строки таблицы в этом стиле (ячейки — строки без переноса)."""
+    sample = Table([['Ag']], colWidths=[100])
+    sample.setStyle(style)
+    sample.wrap(500, 500)
+    return sample._rowHeights[0]
+
+
+def warm():
+    """Шрифты и стили на процесс. Повторные вызовы возвращают готовое."""
+    global _resources
+    if _resources is not None:
+        return _resources
+    with _lock:
+        if _resources is not None:
+            return _resources
+        font, font_bold = _register_fonts()
+        base = getSampleStyleSheet()
+        paragraphs = {
+            'title': ParagraphStyle('ruTitle', parent=base['Heading1'], fontName=font_bold,
+                                    fontSize=18, leading=22, spaceAfter=12),
+            'h2': ParagraphStyle('ruH2', parent=base['Heading2'], fontName=font_bold,
+                                 fontSize=14, leading=18, spaceBefore=12, spaceAfter=8),
+            'normal': ParagraphStyle('ruNormal', parent=base['Normal'], fontName=font,
+                                     fontSize=11, leading=14),
+        }
+        tables = {}
+        for name, theme in TABLE_THEMES.items():
+            style = _table_style(font, font_bold, *theme)
+            tables[name] = (style, _row_height(style))
+        _resources = {'font': font, 'font_bold': font_bold, 'paragraphs': paragraphs, 'tables': tables}
+        return _resources
+
+
+class _SectionMark(Flowable):
+    """Невидимая отметка: запоминает момент, когда вёрстка дошла до начала раздела."""
+
+    def __init__(self, name, marks):
+        super().__init__()
+        self.name = name
+        self.marks = marks
+
+    def wrap(self, avail_width, avail_height):
+        return 0, 0
+
+    def draw(self):
+        self.marks.append((self.name, time.perf_counter()))
+
+
+def _table(rows, col_widths, theme, resources):
+    style, row_height = resources['tables'][theme]
+    table = LongTable(rows, colWidths=col_widths, rowHeights=[row_height] * len(rows),
+                      repeatRows=1, hAlign='LEFT')
+    table.setStyle(style)
+    return table
+
+
+def _sections(report, resources):
+    """Разделы отчёта: пары (имя, список flowables)."""
+    p = resources['paragraphs']
+    period = report.get('period') or {}
+    summary = report.get('summary') or {}
+    sections = []
+
+    sections.append(('header', [
+        Paragraph('Отчет по школьной столовой', p['title']),
+        Paragraph(
+            f"Период: {period.get('from', '')} — {period.get('to', '')} (последние {period.get('days', '')} дн.)",
+            p['normal'],
+        ),
+        Paragraph(f"Сформирован: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", p['normal']),
+        Spacer(1, 12),
+    ]))
+
+    sections.append(('summary', [
+        Paragraph('Сводка', p['h2']),
+        _table([
+            ['Показатель', 'Значение'],
+            ['Выручка', f"{summary.get('total_revenue', 0)} ₽"],
+            ['Затраты на закупки (одобренные)', f"{summary.get('total_costs', 0)} ₽"],
+            ['Прибыль (выручка − затраты)', f"{summary.get('profit', 0)} ₽"],
+            ['Выдано питаний', f"{summary.get('total_meals', 0)}"],
+            ['Активных учеников', f"{summary.get('active_students', 0)}"],
+            ['Заявок на рассмотрении', f"{summary.get('pending_requests', 0)}"],
+        ], [270, 230], 'summary', resources),
+    ]))
+
+    visits = report.get('visits_by_meal') or []
+    if visits:
+        rows = [['Тип питания', 'Количество']]
+        rows.extend([MEAL_LABELS.get(v.get('meal_type'), v.get('meal_type')), str(v.get('count', 0))] for v in visits)
+        sections.append(('visits', [
+            Paragraph('Выдача питания по типам', p['h2']),
+            _table(rows, [270, 230], 'visits', resources),
+        ]))
+
+    low_stock = report.get('low_stock_products') or []
+    if low_stock:
+        rows = [['Продукт', 'Остаток', 'Мин. остаток']]
+        rows.extend(
+            [
+                str(item.get('name', '')),
+                f"{item.get('quantity', '')} {item.get('unit', '')}",
+                f"{item.get('min_quantity', '')} {item.get('unit', '')}",
+            ]
+            for item in low_stock
+        )
+        sections.append(('low_stock', [
+            Paragraph('Продукты ниже минимального остатка', p['h2']),
+            _table(rows, [220, 140, 140], 'low_stock', resources),
+        ]))
+
+    pending = report.get('pending_purchase_requests') or []
+    if pending:
+        rows = [['ID', 'Продукт', 'Кол-во', 'Стоимость', 'Заявитель', 'Дата']]
+        rows.extend(
+            [
+                str(r.get('id', '')),
+                str(r.get('product_name', '')),
+                f"{r.get('quantity', '')} {r.get('unit', '')}",
+                f"{r.get('estimated_cost', 0) or 0} ₽" if r.get('estimated_cost') not in (None, '') else '-',
+                str(r.get('requested_by_name', '') or ''),
+                str(r.get('created_at', '') or '')[:10],
+            ]
+            for r in pending[:PENDING_ROWS_MAX]
+        )
+        sections.append(('pending', [
+            Paragraph('Заявки на закупку (ожидают рассмотрения)', p['h2']),
+            _table(rows, [36, 150, 90, 70, 120, 70], 'pending', resources),
+        ]))
+
+    top_dishes = report.get('top_dishes') or []
+    if top_dishes:
+        rows = [['Блюдо', 'Категория', 'Кол-во']]
+        rows.extend(
+            [
+                str(d.get('dish_name', '')),
+                MEAL_LABELS.get(d.get('category'), str(d.get('category', ''))),
+                str(d.get('count', 0)),
+            ]
+            for d in top_dishes
+        )
+        sections.append(('top_dishes', [
+            Paragraph('Топ-10 блюд по выдаче', p['h2']),
+            _table(rows, [270, 140, 90], 'top_dishes', resources),
+        ]))
+
+    return sections
+
+
+def render(report: dict):
+    """PDF по данным _collect_full_report. Возвращает (bytes, {раздел: секунды}).
+
+    В timings: warm — подготовка шрифтов и стилей (почти 0 после первого вызова),
+    prepare — сборка таблиц, по разделу — вёрстка и отрисовка, total — всё вместе.
+    """
+    started = time.perf_counter()
+    resources = warm()
+    warmed = time.perf_counter()
+
+    marks = []
+    elems = []
+    for name, flowables in _sections(report, resources):
+        elems.append(_SectionMark(name, marks))
+        elems.extend(flowables)
+    elems.append(_SectionMark(None, marks))
+    prepared = time.perf_counter()
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=36,
+        rightMargin=36,
+        topMargin=36,
+        bottomMargin=36,
+        title='Отчет столовой'
+    )
+    doc.build(elems)
+    finished = time.perf_counter()
+
+    timings = {'warm': warmed - started, 'prepare': prepared - warmed}
+    for (name, at), (_, next_at) in zip(marks, marks[1:]):
+        timings[name] = next_at - at
+    # Последняя страница и запись файла после конца последнего раздела
+    timings['finish'] = finished - marks[-1][1] if marks else finished - prepared
+    timings['total'] = finished - started
+    return buffer.getvalue(), {k: round(v, 4) for k, v in timings.items()}
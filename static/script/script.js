@@ -281,6 +281,7 @@ async function initMainPage() {
         }
         updateSubscriptionPriceUI();
         refreshNotificationBadge();
+        startNotificationUpdates();
     } catch (err) {
         console.error(err);
     }
@@ -352,6 +353,11 @@ function initMainEventHandlers() {
         issueMealForm.addEventListener('submit', handleIssueMealSubmit);
     }
 
+    const issueClassForm = document.getElementById('issueClassForm');
+    if (issueClassForm) {
+        issueClassForm.addEventListener('submit', handleIssueClassSubmit);
+    }
+
 
     const issueMealTypeSelect = document.getElementById('issueMealTypeSelect');
     if (issueMealTypeSelect && issueMealTypeSelect.dataset.bound !== '1') {
@@ -1279,19 +1285,44 @@ async function handleReviewSubmit(e) {
     }
 }
 
-async function loadReviews() {
+function _renderLoadMore(anchorEl, key, nextCursor, onLoadMore) {
+    const id = `${key}LoadMore`;
+    let wrap = document.getElementById(id);
+    if (!anchorEl || !nextCursor) {
+        if (wrap) wrap.remove();
+        return;
+    }
+    if (!wrap) {
+        wrap = document.createElement('div');
+        wrap.id = id;
+        wrap.style.marginTop = '12px';
+        anchorEl.insertAdjacentElement('afterend', wrap);
+    }
+    wrap.innerHTML = '<button class="btn btn-secondary btn-small" type="button">Показать ещё</button>';
+    wrap.querySelector('button').onclick = () => onLoadMore(nextCursor);
+}
+
+let _reviewsCache = [];
+
+async function loadReviews(beforeId = null) {
     const listEl = document.getElementById('reviewsList');
     if (!listEl) return;
 
-    const response = await apiFetch('/api/reviews');
-    const reviews = await response.json();
+    const params = new URLSearchParams({ limit: '10' });
+    if (beforeId) params.set('before_id', String(beforeId));
+    const response = await apiFetch(`/api/reviews?${params.toString()}`);
+    const page = await response.json();
+    _reviewsCache = beforeId ? _reviewsCache.concat(page) : page;
+    const reviews = _reviewsCache;
 
     if (!reviews.length) {
         listEl.innerHTML = '<div style="color: var(--text-light);">Отзывов пока нет</div>';
+        _renderLoadMore(listEl, 'reviews', null);
         return;
     }
 
-    listEl.innerHTML = reviews.slice(0, 10).map(r => {
+    _renderLoadMore(listEl, 'reviews', response.headers.get('X-Next-Cursor'), loadReviews);
+    listEl.innerHTML = reviews.map(r => {
         const rating = Number.isFinite(Number(r.rating)) ? Number(r.rating) : 0;
         return `
             <div class="menu-item review-item">
@@ -1397,7 +1428,7 @@ function _cookHistoryBadge(received) {
     return '<span class="badge badge-warning">Ожидает</span>';
 }
 
-async function loadCookMealHistory() {
+async function loadCookMealHistory(beforeId = null) {
     const table = document.getElementById('cookHistoryTable');
     if (!table) return;
 
@@ -1405,7 +1436,7 @@ async function loadCookMealHistory() {
 
     _syncCookHistoryPeriodUI();
 
-    table.innerHTML = `
+    if (!beforeId) table.innerHTML = `
         <thead>
             <tr>
                 <th>Дата/время</th>
@@ -1420,7 +1451,7 @@ async function loadCookMealHistory() {
             <tr><td colspan="6">Загрузка...</td></tr>
         </tbody>
     `;
-    if (summaryEl) summaryEl.textContent = 'Загрузка...';
+    if (summaryEl && !beforeId) summaryEl.textContent = 'Загрузка...';
 
     const days = _getCookHistoryDays();
     const mealType = document.getElementById('cookHistoryMealTypeSelect')?.value || '';
@@ -1431,6 +1462,7 @@ async function loadCookMealHistory() {
     params.set('limit', '500');
     if (mealType) params.set('meal_type', mealType);
     if (scope) params.set('scope', scope);
+    if (beforeId) params.set('before_id', String(beforeId));
 
     try {
         const resp = await apiFetch(`/api/cook/meal-history?${params.toString()}`);
@@ -1443,8 +1475,11 @@ async function loadCookMealHistory() {
         const items = Array.isArray(data) ? data : (data.items || []);
         const summary = (data && data.summary) ? data.summary : null;
 
-        _cookMealHistoryCache = Array.isArray(items) ? items : [];
+        const pageItems = Array.isArray(items) ? items : [];
+        _cookMealHistoryCache = beforeId ? _cookMealHistoryCache.concat(pageItems) : pageItems;
+        // Сводка с сервера считается по всему периоду, а не по загруженным страницам
         renderCookMealHistory(_cookMealHistoryCache, summary);
+        _renderLoadMore(table, 'cookHistory', data.next_cursor, loadCookMealHistory);
     } catch (e) {
         console.error(e);
         if (summaryEl) summaryEl.textContent = 'Не удалось загрузить историю выдачи';
@@ -2076,12 +2111,19 @@ async function handlePurchaseRequestSubmit(e) {
 }
 
 
-async function loadCookRequests() {
-    const response = await apiFetch('/api/purchase_requests');
-    const requests = await response.json();
+let _cookRequestsCache = [];
+
+async function loadCookRequests(beforeId = null) {
+    const params = new URLSearchParams({ limit: '50' });
+    if (beforeId) params.set('before_id', String(beforeId));
+    const response = await apiFetch(`/api/purchase_requests?${params.toString()}`);
+    const page = await response.json();
+    _cookRequestsCache = beforeId ? _cookRequestsCache.concat(page) : page;
+    const requests = _cookRequestsCache;
 
     const table = document.getElementById('requestsTable');
     if (!table) return;
+    _renderLoadMore(table, 'cookRequests', response.headers.get('X-Next-Cursor'), loadCookRequests);
 
     table.innerHTML = `
         <thead>
@@ -2133,6 +2175,46 @@ async function refreshNotificationBadge() {
 }
 
 
+let notificationUpdatesActive = false;
+let notificationLastId = -1;
+// Пока вкладка скрыта, новые уведомления проверяются не чаще раза в 30 секунд
+const NOTIFICATION_HIDDEN_MS = 30000;
+
+async function _checkNotifications() {
+    const resp = await apiFetch(`/api/notifications/wait?after=${notificationLastId}`);
+    if (!resp.ok) return 15000;
+    const data = await resp.json();
+    const items = data.items || [];
+    const badge = _getNotificationBadgeEl();
+    if (badge) {
+        _setBadgeCount([badge, ..._getMirroredBadgeEls(badge.id)], Number(data.unread || 0));
+    }
+    items.forEach((item) => showNotification(item.title || 'Новое уведомление', 'info'));
+    const listEl = _getNotificationsListEl();
+    if (items.length && listEl && listEl.offsetParent !== null) {
+        loadNotifications();
+    }
+    notificationLastId = Number(data.last_id || 0);
+    return Number(data.retry_after || 15) * 1000;
+}
+
+async function startNotificationUpdates() {
+    // Сервер сам держит запрос несколько секунд, пока нет новых уведомлений,
+    // и подсказывает в retry_after, когда спросить снова
+    if (notificationUpdatesActive) return;
+    notificationUpdatesActive = true;
+    while (notificationUpdatesActive) {
+        let delay = 15000;
+        try {
+            delay = await _checkNotifications();
+        } catch (e) {
+        }
+        if (document.hidden) delay = Math.max(delay, NOTIFICATION_HIDDEN_MS);
+        await new Promise((resolve) => setTimeout(resolve, delay));
+    }
+}
+
+
 function _getNotificationsListEl() {
     if (currentRole === 'student') return document.getElementById('studentNotificationsList');
     if (currentRole === 'cook') return document.getElementById('cookNotificationsList');
@@ -2173,14 +2255,20 @@ function _renderNotifications(listEl, items) {
 }
 
 
-async function loadNotifications() {
+let _notificationsCache = [];
+
+async function loadNotifications(beforeId = null) {
     const listEl = _getNotificationsListEl();
     if (!listEl) return;
-    listEl.innerHTML = `<p style="color: var(--text-light); font-size: 12px;">Загрузка...</p>`;
+    if (!beforeId) listEl.innerHTML = `<p style="color: var(--text-light); font-size: 12px;">Загрузка...</p>`;
     try {
-        const resp = await apiFetch('/api/notifications?limit=100');
-        const items = await resp.json();
-        _renderNotifications(listEl, items);
+        const params = new URLSearchParams({ limit: '50' });
+        if (beforeId) params.set('before_id', String(beforeId));
+        const resp = await apiFetch(`/api/notifications?${params.toString()}`);
+        const page = await resp.json();
+        _notificationsCache = beforeId ? _notificationsCache.concat(page) : page;
+        _renderNotifications(listEl, _notificationsCache);
+        _renderLoadMore(listEl, listEl.id, resp.headers.get('X-Next-Cursor'), loadNotifications);
         refreshNotificationBadge();
     } catch (e) {
         listEl.innerHTML = `<p style="color: var(--danger); font-size: 12px;">Не удалось загрузить уведомления.</p>`;
@@ -2188,6 +2276,21 @@ async function loadNotifications() {
 }
 
 
+async function markAllNotificationsRead() {
+    try {
+        const resp = await apiFetch('/api/notifications/read_all', { method: 'POST' });
+        const data = await resp.json();
+        if (resp.ok) {
+            await loadNotifications();
+        } else {
+            showNotification(data.error || 'Не удалось отметить уведомления', 'error');
+        }
+    } catch (e) {
+        showNotification('Ошибка подключения', 'error');
+    }
+}
+
+
 async function markNotificationRead(notificationId) {
     try {
         const resp = await apiFetch(`/api/notifications/${encodeURIComponent(notificationId)}/read`, {
@@ -2345,6 +2448,9 @@ function renderIssueStudentSuggestions(items) {
         if (s.school) metaParts.push(s.school);
         if (s.class_name) metaParts.push(`класс ${s.class_name}`);
         if (s.username) metaParts.push(`логин: ${s.username}`);
+        const issued = Array.isArray(s.issued_today) ? s.issued_today : [];
+        if (issued.includes('breakfast')) metaParts.push('завтрак уже выдан');
+        if (issued.includes('lunch')) metaParts.push('обед уже выдан');
         const meta = metaParts.join(' • ');
 
         return `
@@ -2440,6 +2546,45 @@ async function handleIssueMealSubmit(e) {
     }
 }
 
+async function handleIssueClassSubmit(e) {
+    e.preventDefault();
+    const className = (document.getElementById('issueClassName')?.value || '').trim();
+    const mealType = document.getElementById('issueMealTypeSelect')?.value || 'breakfast';
+    const menuItemId = document.getElementById('issueMenuItemSelect')?.value || '';
+    const box = document.getElementById('issueClassResults');
+
+    const response = await apiFetch('/api/issue_meal/batch', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({class_name: className, meal_type: mealType, menu_item_id: menuItemId})
+    });
+
+    const data = await response.json();
+
+    if (!response.ok) {
+        if (box) box.innerHTML = '';
+        showNotification(data.error || 'Ошибка', 'error');
+        return;
+    }
+
+    showNotification(data.message || 'Питание выдано', data.failed ? 'error' : 'success');
+    loadMealStats();
+    loadProducts();
+    if (typeof loadCookMealHistory === 'function') {
+        loadCookMealHistory();
+    }
+
+    if (box) {
+        const failed = (data.results || []).filter(r => !r.ok);
+        box.innerHTML = failed.map(r => `
+            <div class="suggestion-item">
+                <div class="suggestion-title">${escapeHtml(r.full_name || `#${r.student_id}`)}</div>
+                <div class="suggestion-meta">${escapeHtml(r.error || '')}</div>
+            </div>
+        `).join('');
+    }
+}
+
 function showAdminSection(section, el) {
     document.querySelectorAll('#adminDashboard .nav-item').forEach(item => item.classList.remove('active'));
     if (el) el.classList.add('active');
@@ -2468,12 +2613,19 @@ async function loadAdminStats() {
     if (activeEl) activeEl.textContent = stats.active_students || 0;
 }
 
-async function loadAdminRequests() {
-    const response = await apiFetch('/api/purchase_requests');
-    const requests = await response.json();
+let _adminRequestsCache = [];
+
+async function loadAdminRequests(beforeId = null) {
+    const params = new URLSearchParams({ limit: '50' });
+    if (beforeId) params.set('before_id', String(beforeId));
+    const response = await apiFetch(`/api/purchase_requests?${params.toString()}`);
+    const page = await response.json();
+    _adminRequestsCache = beforeId ? _adminRequestsCache.concat(page) : page;
+    const requests = _adminRequestsCache;
 
     const table = document.getElementById('adminRequestsTable');
     if (!table) return;
+    _renderLoadMore(table, 'adminRequests', response.headers.get('X-Next-Cursor'), loadAdminRequests);
 
     table.innerHTML = `
         <thead>
@@ -2571,9 +2723,7 @@ function getReportDays() {
     return Math.min(Math.max(raw, 1), 365);
 }
 
-function downloadReport(format = 'pdf') {
-    const days = getReportDays();
-    const url = `/api/report/download?format=${encodeURIComponent(format)}&days=${encodeURIComponent(days)}`;
+function openDownload(url) {
     const a = document.createElement('a');
     a.href = url;
     a.target = '_blank';
@@ -2583,6 +2733,47 @@ function downloadReport(format = 'pdf') {
     a.remove();
 }
 
+async function downloadReport(format = 'pdf') {
+    const days = getReportDays();
+    try {
+        const response = await apiFetch('/api/report/jobs', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ format, days })
+        });
+        let job = await response.json();
+        if (!response.ok) {
+            showNotification(job.error || 'Не удалось поставить отчёт в очередь', 'error');
+            return;
+        }
+
+        showNotification('Отчёт формируется…', 'info');
+        const deadline = Date.now() + 5 * 60 * 1000;
+        while (job.status === 'queued' || job.status === 'running') {
+            if (Date.now() > deadline) {
+                showNotification('Отчёт формируется слишком долго, попробуйте позже', 'error');
+                return;
+            }
+            await new Promise(resolve => setTimeout(resolve, 1000));
+            const statusResponse = await apiFetch(`/api/report/jobs/${encodeURIComponent(job.id)}`);
+            job = await statusResponse.json();
+            if (!statusResponse.ok) {
+                showNotification(job.error || 'Задание не найдено', 'error');
+                return;
+            }
+        }
+
+        if (job.status !== 'done') {
+            showNotification(job.error || 'Не удалось сформировать отчёт', 'error');
+            return;
+        }
+        openDownload(`/api/report/jobs/${encodeURIComponent(job.id)}/download`);
+    } catch (error) {
+        // Фоновая очередь недоступна — скачиваем отчёт напрямую
+        openDownload(`/api/report/download?format=${encodeURIComponent(format)}&days=${encodeURIComponent(days)}`);
+    }
+}
+
 async function loadReport() {
     const days = getReportDays();
     const response = await apiFetch(`/api/report?days=${encodeURIComponent(days)}`);
@@ -3939,6 +4130,7 @@ if (typeof originalInitMainPage === 'function') {
             initMainEventHandlers();
             updateSubscriptionPriceUI();
             refreshNotificationBadge();
+            startNotificationUpdates();
             updateHeaderBalance();
         } catch (err) {
             console.error(err);
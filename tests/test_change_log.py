@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+_tmp = tempfile.mkdtemp()
+os.environ.setdefault('CANTEEN_DB', os.path.join(_tmp, 'canteen.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as canteen  # noqa: E402
+
+
+class MealClaimChangeLogTest(unittest.TestCase):
+    """Записи change_log о выдаче питания по абонементу."""
+
+    @classmethod
+    def setUpClass(cls):
+        canteen.init_db()
+
+    def _login(self, username):
+        client = canteen.app.test_client()
+        response = client.post('/api/login', json={'username': username, 'password': 'password123'})
+        self.assertEqual(response.status_code, 200)
+        return client
+
+    def test_both_subscription_debits_one_day_for_two_meals(self):
+        db = canteen.get_db()
+        cursor = db.cursor()
+        user_id = cursor.execute("SELECT id FROM users WHERE username = 'student1'").fetchone()['id']
+        cursor.execute(
+            """
+            INSERT INTO payments (user_id, payment_type, meal_type, amount, days_remaining, status, created_date)
+            VALUES (?, 'subscription', 'both', 4000, 20, 'active', DATE('now'))
+            """,
+            (user_id,)
+        )
+        sub_id = cursor.lastrowid
+        since = cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+        db.commit()
+        db.close()
+
+        cook = self._login('cook1')
+        for meal_type in ('breakfast', 'lunch'):
+            response = cook.post('/api/issue_meal', json={'username': 'student1', 'meal_type': meal_type})
+            self.assertEqual(response.status_code, 200, response.get_json())
+
+        db = canteen.get_db()
+        try:
+            days = db.execute("SELECT days_remaining FROM payments WHERE id = ?", (sub_id,)).fetchone()[0]
+            rows = db.execute(
+                "SELECT payload FROM change_log WHERE entity = 'meal_claim' AND seq > ? ORDER BY seq",
+                (since,)
+            ).fetchall()
+        finally:
+            db.close()
+
+        self.assertEqual(days, 19)
+        payloads = [json.loads(r['payload']) for r in rows]
+        charges = [{k: p[k] for k in ('subscription_id', 'days_debited')} for p in payloads]
+        self.assertEqual(charges, [
+            {'subscription_id': sub_id, 'days_debited': 1},
+            {'subscription_id': sub_id, 'days_debited': 0},
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()